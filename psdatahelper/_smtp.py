@@ -0,0 +1,125 @@
+import atexit
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+# Open SMTP connections and the time each was last used, keyed by SMTP host and port
+_POOL: dict[tuple[str, int], tuple[smtplib.SMTP, float]] = {}
+
+# Locks serializing use of each pooled connection, which is not safe to share between threads,
+# keyed by SMTP host and port
+_CONNECTION_LOCKS: dict[tuple[str, int], threading.Lock] = {}
+
+# Lock guarding lookups in the pool and connection locks, never held while talking to a server
+_POOL_LOCK = threading.Lock()
+
+# Number of seconds a connection may sit idle before it is closed instead of reused
+_IDLE_TIMEOUT = 100
+
+# Number of seconds to wait on the SMTP server before giving up on connecting or sending
+_SOCKET_TIMEOUT = 30
+
+
+@contextmanager
+def connection(smtp_server: str):
+    """
+    Provide an open SMTP connection to the specified server, reusing a pooled connection if it is
+    still live.
+
+    The connection is discarded if an exception is raised while it is in use, so that the next
+    caller reconnects.
+
+    Parameters
+    ----------
+    smtp_server : str
+        The SMTP server address, optionally followed by a colon and port number.
+
+    Yields
+    ------
+    smtplib.SMTP
+        The open SMTP connection.
+    """
+
+    key = _pool_key(smtp_server)
+
+    # Look up the lock for the server, so that only callers of the same server wait on each other
+    with _POOL_LOCK:
+        connection_lock = _CONNECTION_LOCKS.setdefault(key, threading.Lock())
+
+    with connection_lock:
+        # Take the pooled connection, if any, out of the pool while it is in use
+        with _POOL_LOCK:
+            smtp, last_used = _POOL.pop(key, (None, 0.0))
+
+        # Discard the pooled connection if it has been idle too long or the server no longer
+        # responds to it
+        if smtp is not None and (time.monotonic() - last_used > _IDLE_TIMEOUT or
+                                 not _is_live(smtp)):
+            _close(smtp)
+            smtp = None
+
+        # Otherwise open a new connection
+        if smtp is None:
+            smtp = smtplib.SMTP(key[0], key[1], timeout=_SOCKET_TIMEOUT)
+
+        try:
+            yield smtp
+
+        except BaseException:
+            # Close the connection if an error occurred while it was in use
+            _close(smtp)
+
+            raise
+
+        # Return the connection to the pool once it has been used without errors
+        with _POOL_LOCK:
+            _POOL[key] = (smtp, time.monotonic())
+
+
+def close_all():
+    """
+    Close all pooled SMTP connections.
+    """
+
+    # Empty the pool, leaving any connections currently in use to their callers
+    with _POOL_LOCK:
+        connections = [smtp for smtp, _ in _POOL.values()]
+        _POOL.clear()
+
+    # End each SMTP session outside the lock
+    for smtp in connections:
+        _close(smtp)
+
+
+def _pool_key(smtp_server: str) -> tuple[str, int]:
+    # Split an optional port from the server address the same way smtplib does, using the default
+    # SMTP port if none is given
+    host, separator, port = smtp_server.rpartition(':')
+
+    if separator and ':' not in host and port.isdigit():
+        return host.lower(), int(port)
+
+    return smtp_server.lower(), smtplib.SMTP_PORT
+
+
+def _is_live(smtp: smtplib.SMTP) -> bool:
+    # Probe the connection with a NOOP command
+    try:
+        return smtp.noop()[0] == 250
+
+    except OSError:
+        return False
+
+
+def _close(smtp: smtplib.SMTP):
+    # End the SMTP session, ignoring errors from a connection that was already closed
+    try:
+        smtp.quit()
+
+    except OSError:
+        smtp.close()
+
+
+# Close the pooled connections when the program exits
+atexit.register(close_all)
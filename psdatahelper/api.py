@@ -7,15 +7,24 @@
 #  resource classes
 
 import pandas as pd
+import numpy as np
+import datetime
+import decimal
+import functools
 import json
+import operator
+import threading
 from .credential import Credential
 from .datatools import DataTools as dt
 from .log import Log
+from concurrent.futures import ThreadPoolExecutor
 from oauthlib.oauth2 import BackendApplicationClient
 from oauthlib.oauth2.rfc6749.errors import InvalidClientError
+from requests.adapters import HTTPAdapter
 from requests.models import Response
 from requests_oauthlib import OAuth2Session
 from typing import Optional
+from urllib3.util.retry import Retry
 
 
 class API:
@@ -24,13 +33,17 @@ class API:
 
     Methods
     -------
-    __init__(credential, log)
+    __init__(credential, log, max_workers)
         Initialize the API instance.
-    __del__()
+    __enter__()
+        Return the API instance for use as a context manager.
+    __exit__(exc_type, exc_value, traceback)
+        Close the API session when leaving the context manager.
+    close()
         Close the API session.
     pq_set_prefix(self, pq_prefix: str)
         Set the prefix for PowerQuery names.
-    pq_run(pq_name, pq_parameters)
+    pq_run(pq_name, pq_parameters, dtype_backend)
         Run the given PowerQuery and return the results as a Pandas DataFrame.
     table_get_record(table_name, record_id, projection)
         Retrieve a specific record from a table.
@@ -49,7 +62,7 @@ class API:
         Delete multiple records contained in the given Pandas DataFrame from the given table.
     """
 
-    def __init__(self, credential: Credential, log: Log = Log('ps_api')):
+    def __init__(self, credential: Credential, log: Log | None = None, max_workers: int = 16):
         """
         Initialize the API instance and connect to the PowerSchool API.
 
@@ -58,12 +71,28 @@ class API:
         credential : Credential
             The Credential instance containing API credentials.
         log : Log, optional
-            The log instance to use for logging (default is Log('ps_api')).
+            The log instance to use for logging (default is None, which uses Log('ps_api')).
+        max_workers : int, optional
+            The number of records the bulk table methods send concurrently (default is 16). Use 1
+            to send records one at a time.
+
+        Raises
+        ------
+        ValueError
+            If max_workers is less than 1.
         """
 
-        # Store the provided credential and log instances
+        # Reject a number of concurrent requests that the bulk record methods cannot use
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, not {max_workers}")
+
+        # Store the provided credential and log instances, creating the default log if none is
+        # provided
         self._credential = credential
-        self._log = log
+        self._log = log if log is not None else Log('ps_api')
+
+        # Store the number of concurrent requests used by the bulk record methods
+        self._max_workers = max_workers
 
         # Initialize connection status and prefix for queries
         self._api_connected = False
@@ -74,6 +103,28 @@ class API:
         self._EMPTY_DF_LOG_MSG = 'Input DataFrame is empty. No records processed.'
         self._API_NOT_CONNECTED_LOG_MSG = 'API not connected. Unable to perform operation.'
 
+        # Define log messages for unsuccessful response status codes
+        self._STATUS_CODE_LOG_MSGS = {
+            400: 'Bad request to {resource}:\n\t{text}',
+            401: 'Unauthorized request to {resource}:\n\t{text}',
+            404: 'Resource not found: {resource}',
+            405: 'Method "{method}" not allowed for {resource}',
+            409: 'Conflict with {resource}:\n\t{text}',
+            415: 'Unsupported media type for {resource}:\n\t{text}',
+            500: 'Internal server error for {resource}:\n\t{text}',
+            509: 'Resource throttling currently in place for {resource}:\n\t{text}'
+        }
+
+        # Define the Plugin XML template used for access requests
+        self._ACCESS_REQUEST_TEMPLATE = ('\n<field table="{table}" field="{field}" '
+                                         'access="{access}"/>')
+
+        # Create a lock so that concurrent requests share a single access token refresh
+        self._token_lock = threading.Lock()
+
+        # Track whether a failed access token refresh has been logged
+        self._token_refresh_failed = False
+
         # Check if the credentials have been loaded successfully
         if not self._credential.loaded:
             # Log an error if the API cannot connect due to unloaded credentials
@@ -104,24 +155,67 @@ class API:
             # Log a debug message indicating successful connection to the API
             self._log.debug('Connected to the PowerSchool API')
 
-            # Set the headers for the API session
-            self.session.headers = {
-                'Content-Type': 'application/json',
-                'Accept':       'application/json'
-            }
+            # Set the headers for the API session, keeping the session's default headers and
+            # requesting compressed responses over a persistent connection
+            self.session.headers.update({
+                'Content-Type':    'application/json',
+                'Accept':          'application/json',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection':      'keep-alive'
+            })
+
+            # Retry throttled and failed requests with backoff. POST is not retried so that a
+            # record insert that reached the server is never sent twice.
+            retry = Retry(total=5, backoff_factor=0.3,
+                          status_forcelist=[429, 500, 502, 503, 504, 509],
+                          allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+                          raise_on_status=False)
+
+            # Size the connection pool to match the number of concurrent bulk requests
+            self.session.mount('https://', HTTPAdapter(pool_connections=self._max_workers,
+                                                       pool_maxsize=self._max_workers,
+                                                       max_retries=retry))
 
             # Mark the API as connected
             self._api_connected = True
 
-    def __del__(self):
+    def __enter__(self):
+        """
+        Return the API instance for use as a context manager.
+
+        Returns
+        -------
+        API
+            The API instance.
+
+        Examples
+        --------
+        >>> with API(credential) as api:
+        ...     api.pq_run('com.pearson.core.student.student_dcid_id_map')
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the API session when leaving the context manager.
+        """
+
+        self.close()
+
+    def close(self):
         """
         Close the API session.
         """
 
+        # Skip closing if the session was never created
+        if not hasattr(self, 'session'):
+            return
+
         # Log a debug message indicating that the API session is being closed
         self._log.debug('Closing API session')
 
-        # Close the API session to release resources
+        # Close the API session to release its pooled connections
         self.session.close()
 
     # TODO: Implement conditional parsing to account for differences between PowerQuery and table
@@ -129,31 +223,21 @@ class API:
     def _access_requests_parse(self, response: Response, read_only: bool = True) -> list[str]:
         # Check if the response status code indicates a forbidden access (403)
         if response.status_code == 403:
-            access_requests = []
-
             # Determine the access level based on the read_only flag
-            if read_only:
-                access_level = 'ViewOnly'
-
-            else:
-                access_level = 'FullAccess'
+            access_level = 'ViewOnly' if read_only else 'FullAccess'
 
             try:
-                # Parse the JSON response to extract access request errors
-                for error in response.json()['errors']:
-                    # Format and append each access request as a Plugin XML access request string
-                    access_requests.append(
-                            f'\n<field table="{error["resource"]}" field="{error["field"]}" '
-                            f'access="{access_level}"/>')
+                # Parse the access requests from the response content. Bulk operations commonly
+                # receive the same 403 response for every record, so the parsed result is cached.
+                return list(self._access_requests_build(response.content,
+                                                        self._ACCESS_REQUEST_TEMPLATE,
+                                                        access_level))
 
             except Exception as e:
                 # Log an error if there is an issue parsing the access requests
                 self._log.error(f"Error parsing access requests: {e}")
 
-            # Sort the access requests before returning
-            access_requests.sort()
-
-            return access_requests
+                return []
 
         else:
             # Log an error if the response status code is not 403
@@ -163,51 +247,69 @@ class API:
             # Return an empty list
             return []
 
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _access_requests_build(content: bytes, template: str, access_level: str) -> tuple[str, ...]:
+        # Parse the JSON content and format each access request error as a sorted tuple of Plugin
+        # XML access request strings
+        return tuple(sorted(
+                template.format(table=error['resource'], field=error['field'],
+                                access=access_level)
+                for error in json.loads(content)['errors']))
+
     # TODO: Implement detailed parsing of the Results object in the response
     def _response_log_status_code(self, resource: str, method: str, response: Response):
-        # Log error messages based on the HTTP status code of the response
-        match response.status_code:
-            case 400:
-                # Log a bad request error with the resource and response text
-                self._log.error(f"Bad request to {resource}:\n\t{response.text}")
-
-            case 401:
-                # Log an unauthorized request error with the resource and response text
-                self._log.error(f"Unauthorized request to {resource}:\n\t{response.text}")
-
-            case 404:
-                # Log a resource not found error
-                self._log.error(f"Resource not found: {resource}")
-
-            case 405:
-                # Log an error for method not allowed on the specified resource
-                self._log.error(f'Method "{method}" not allowed for {resource}')
-
-            case 409:
-                # Log a conflict error with the resource and response text
-                self._log.error(f"Conflict with {resource}:\n\t{response.text}")
-
-            case 415:
-                # Log an unsupported media type error with the resource and response text
-                self._log.error(f"Unsupported media type for {resource}:\n\t{response.text}")
-
-            case 500:
-                # Log an internal server error with the resource and response text
-                self._log.error(f"Internal server error for {resource}:\n\t{response.text}")
-
-            case 509:
-                # Log a resource throttling error with the resource and response text
-                self._log.error(
-                        f"Resource throttling currently in place for {resource}:\n\t"
-                        f"{response.text}")
+        # Look up the log message for the HTTP status code of the response
+        log_msg = self._STATUS_CODE_LOG_MSGS.get(response.status_code)
+
+        # Log an error with the resource, method and response text if the status code has a message
+        if log_msg is not None:
+            self._log.error(log_msg.format(resource=resource, method=method, text=response.text))
+
+    def _token_refresh(self):
+        # Skip the refresh if the session already uses the credential's current access token and
+        # the token does not need refreshing yet
+        if (self.session.access_token == self._credential.fields['access_token'] and
+                not self._credential.token_refresh_due()):
+            return
+
+        with self._token_lock:
+            # Obtain a new access token unless another request refreshed it while waiting for the
+            # lock
+            if self._credential.token_refresh_due():
+                self._log.debug('Refreshing API access token')
+
+                if self._credential.refresh_access_token():
+                    self._token_refresh_failed = False
+
+                # The credential waits before retrying a failed refresh, so requests carry on with
+                # the current token in the meantime. Log the error once per outage.
+                elif not self._token_refresh_failed:
+                    self._log.error('Unable to refresh API access token')
+                    self._token_refresh_failed = True
+
+            # Update the session to use the credential's current access token, which may also have
+            # been refreshed in the background by the credential
+            if self.session.access_token != self._credential.fields['access_token']:
+                self.session.token = {
+                    'token_type':   'Bearer',
+                    'access_token': self._credential.fields['access_token']
+                }
 
     def _request(self, method: str, resource: str, read_only: bool = True,
                  suppress_log: bool = False, **kwargs):
+        # Refresh the access token if it is about to expire
+        self._token_refresh()
+
         # Send an HTTP request using the specified method and resource URL
         response = self.session.request(method=method,
                                         url=f"{self._credential.server_address}{resource}",
                                         **kwargs)
 
+        # Return successful responses without any further checks
+        if 200 <= response.status_code < 300:
+            return response
+
         # Check if the response indicates forbidden access (403)
         if response.status_code == 403:
             # Parse access requests from the response
@@ -225,13 +327,46 @@ class API:
                 # Attach the access requests to the response object
                 response.access_requests = access_requests
 
-        # Log the status code for responses that are not successful (not 200) and not suppressed
-        elif response.status_code != 200 and not suppress_log:
+        # Log the status code for unsuccessful responses unless suppressed
+        elif not suppress_log:
             self._response_log_status_code(resource, method, response)
 
         # Return the HTTP response object
         return response
 
+    def _records_request(self, request_record, rows: list,
+                         key=None) -> tuple[pd.api.extensions.ExtensionArray,
+                                            pd.api.extensions.ExtensionArray]:
+        # Send the first record on its own so that any error for the operation is logged once
+        responses = [request_record(rows[0], False)] + [None] * (len(rows) - 1)
+
+        # Group the positions of the remaining records by key, so that records for the same key
+        # are sent one after another in input order rather than racing each other. Without a key,
+        # each record is its own group.
+        groups = {}
+
+        for position in range(1, len(rows)):
+            groups.setdefault(position if key is None else key(rows[position]), []).append(position)
+
+        # Define a function to send the records of a single group in order
+        def request_group(positions: list[int]) -> list[tuple[int, str]]:
+            return [request_record(rows[position], True) for position in positions]
+
+        # Send the groups concurrently with logging suppressed, placing each response at the
+        # position of its record
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for positions, group_responses in zip(groups.values(),
+                                                  executor.map(request_group, groups.values())):
+                for position, response in zip(positions, group_responses):
+                    responses[position] = response
+
+        # Split the responses into compact arrays of status codes and texts, which keep the result
+        # columns out of the object dtype
+        statuses = pd.array([status for status, _ in responses], dtype='int16')
+        texts = pd.array([text for _, text in responses], dtype='string')
+
+        return statuses, texts
+
     # TODO: Refactor to handle failed pq requests
     def _pq_parse_response(self, response: Response) -> pd.DataFrame:
         # Parse the JSON response from the PowerQuery API
@@ -242,27 +377,30 @@ class API:
             # Log the number of records returned from the API
             self._log.debug(f"{len(response_json['record'])} records returned from PQ")
 
-            records = []  # List to hold parsed records
-            fields = {}  # Dictionary to hold field values
+            record_count = len(response_json['record'])
+            columns = {}  # Dictionary of column names to lists of column values
             tables = response_json['record'][0][
                 'tables'].keys()  # Get table names from the first record
 
             # Iterate through each record in the response
-            for record in response_json['record']:
+            for index, record in enumerate(response_json['record']):
                 # Iterate through each table associated with the record
                 for table in tables:
-                    # Extract key-value pairs from the table and update the fields dictionary
+                    # Store each value in its column, creating columns as they are first seen and
+                    # leaving missing values as NaN
                     for key, value in record['tables'][table].items():
-                        fields.update({f"{table}.{key}": value})
+                        column = columns.get(f"{table}.{key}")
 
-                # Append a copy of the fields dictionary to the records list
-                records.append(fields.copy())
+                        if column is None:
+                            column = columns[f"{table}.{key}"] = [float('nan')] * record_count
 
-                # Clear fields for the next record
-                fields.clear()
+                        column[index] = value
+
+            # Release the parsed response before building the DataFrame
+            del response_json
 
             # Return the records as a pandas DataFrame
-            return pd.DataFrame(records)
+            return pd.DataFrame(columns)
 
         # If only records are present without tables, return them as a DataFrame
         elif 'record' in response_json:
@@ -318,20 +456,15 @@ class API:
         # Add the 'action' column to the records DataFrame
         records['action'] = 'UPDATE'
 
-        payload = f'{{"students":{{"student":{records.to_json(orient="records")}}}}}'
-
         # Convert the records to a dictionary formatted for the API payload
-        # payload_dict = {
-        #     'students': {
-        #         'student': records.to_dict(orient='records')
-        #     }
-        # }
-
-        # Convert the payload dictionary to a JSON string
-        # payload_json = json.dumps(payload_dict)
+        payload_dict = {
+            'students': {
+                'student': records.to_dict(orient='records')
+            }
+        }
 
-        # Return the JSON payload string
-        return payload
+        # Convert the payload dictionary to a compact JSON string
+        return json.dumps(payload_dict, separators=(',', ':'), default=self._json_default)
 
     def _students_parse_response(self, response: Response) -> pd.DataFrame:
         if response.status_code == 200:
@@ -365,6 +498,39 @@ class API:
 
             return pd.DataFrame()
 
+    @staticmethod
+    def _json_default(value):
+        # Encode the values json cannot encode itself the same way pandas' to_json does, which
+        # built the payloads before they were serialized with json.dumps
+
+        # Send dates and times as milliseconds since the epoch, treating naive values as UTC
+        if isinstance(value, (datetime.date, np.datetime64)):
+            return pd.Timestamp(value).value // 1_000_000
+
+        # Send durations as milliseconds
+        if isinstance(value, (datetime.timedelta, np.timedelta64)):
+            return pd.Timedelta(value).value // 1_000_000
+
+        # Send times of day as ISO formatted text
+        if isinstance(value, datetime.time):
+            return value.isoformat()
+
+        # Send decimals as numbers
+        if isinstance(value, decimal.Decimal):
+            return float(value)
+
+        # Send numpy scalars, such as those held in object columns, as plain numbers and booleans
+        if isinstance(value, np.generic):
+            return value.item()
+
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    @staticmethod
+    def _table_build_payload(table_name: str, row: dict) -> str:
+        # Convert the row to a compact JSON string formatted for a table API request
+        return json.dumps({'tables': {table_name: row}}, separators=(',', ':'),
+                          default=API._json_default)
+
     # TODO: Refactor to handle failed table requests
     def _table_parse_response(self, response: Response, table_name: str) -> pd.DataFrame:
         # Parse the JSON response from the API for a specific table
@@ -440,7 +606,8 @@ class API:
         # Log a debug message indicating that the PowerQuery prefix has been set
         self._log.debug(f"PowerQuery prefix set to {self._pq_prefix}")
 
-    def pq_run(self, pq_name: str, pq_parameters: Optional[dict] = None) -> pd.DataFrame:
+    def pq_run(self, pq_name: str, pq_parameters: Optional[dict] = None,
+               dtype_backend: Optional[str] = None) -> pd.DataFrame:
         """
         Run the given PowerQuery and return the results as a Pandas DataFrame.
 
@@ -450,6 +617,10 @@ class API:
             The name of the PowerQuery to run.
         pq_parameters : dict, optional
             A dictionary of parameters to pass to the PowerQuery (default is None).
+        dtype_backend : {'numpy_nullable', 'pyarrow'}, optional
+            The dtype backend to convert the results to (default is None, which keeps the default
+            NumPy-backed object columns). 'pyarrow' requires the pyarrow package and gives a
+            considerably smaller memory footprint for large results.
 
         Returns
         -------
@@ -482,7 +653,7 @@ class API:
         # Check if there are parameters to include in the request
         if pq_parameters is not None and len(pq_parameters) > 0:
             # Convert the parameters to JSON format for the request
-            payload = json.dumps(pq_parameters)
+            payload = json.dumps(pq_parameters, separators=(',', ':'))
 
             # Send a POST request to run the PowerQuery with parameters
             response = self._request('post',
@@ -498,8 +669,15 @@ class API:
         if response.status_code == 200:
             self._log.debug('Query successful')
 
-            # Parse and return the response as a DataFrame
-            return self._pq_parse_response(response)
+            # Parse the response as a DataFrame
+            results = self._pq_parse_response(response)
+
+            # Convert the results to the requested dtype backend
+            if dtype_backend is not None:
+                results = results.convert_dtypes(dtype_backend=dtype_backend)
+
+            # Return the results DataFrame
+            return results
 
         # Handle unsuccessful requests
         else:
@@ -755,41 +933,37 @@ class API:
         # Log the attempt to insert records into the specified table
         self._log.debug(f"Inserting records into {table_name}")
 
-        access_requests_needed = False  # Flag to track if access requests are needed
-        suppress_log = False  # Flag to suppress logging for specific cases
+        # Build the table resource once for all records
+        table_resource = f"/ws/schema/table/{table_name}"
 
         # Define a function to insert a single record
-        def insert_records(row):
-            nonlocal access_requests_needed
-            nonlocal suppress_log
-
-            # Convert the row to JSON format, dropping any null values
-            row_json = row.dropna().to_json()
-
-            # Create the payload for the API request with the correct formatting
-            payload = f'{{"tables":{{"{table_name}":{row_json}}}}}'
+        def insert_record(row: dict, suppress_log: bool) -> tuple[int, str]:
+            # Convert the row to a JSON payload formatted for the API request
+            payload = self._table_build_payload(table_name, row)
 
             # Send a POST request to insert the record into the specified table
-            response = self._request('post', resource=f"/ws/schema/table/{table_name}",
-                                     read_only=False,
+            response = self._request('post', resource=table_resource, read_only=False,
                                      suppress_log=suppress_log, data=payload)
 
-            # Suppress further logging after the first request
-            suppress_log = True
+            # Return the response status code and text for tracking. The text is kept for
+            # successful responses too, since it contains the ID of an inserted record.
+            return response.status_code, response.text
 
-            # Check if access requests are needed based on the response status code
-            if not access_requests_needed and response.status_code == 403:
-                access_requests_needed = True
+        # Convert each row in the DataFrame to a dictionary, dropping any null values
+        columns = records.columns.tolist()
+        rows = [{column: value for column, value, present in zip(columns, values, not_null)
+                 if present}
+                for values, not_null in zip(records.itertuples(index=False, name=None),
+                                            records.notna().to_numpy())]
 
-            # Store the response status code and text in the row for tracking
-            row['response_status_code'] = response.status_code
-            row['response_text'] = response.text
+        # Send the insert requests for each row in the DataFrame
+        statuses, texts = self._records_request(insert_record, rows)
 
-            # Return the updated row
-            return row
+        # Check if access requests are needed based on the response status codes
+        access_requests_needed = 403 in statuses
 
-        # Apply the insert_records function to each row in the DataFrame
-        results = records.apply(insert_records, axis=1)
+        # Store the response status codes and texts in the results for tracking
+        results = records.assign(response_status_code=statuses, response_text=texts)
 
         # Identify rows where the response status code indicates failure (not 200)
         errors = results.loc[results['response_status_code'] != 200]
@@ -827,7 +1001,7 @@ class API:
         -------
         pd.DataFrame
             A DataFrame containing the results of the update operations, including response
-            status codes and texts.
+            status codes and, for failed operations, response texts.
             Returns an empty DataFrame if the API is not connected, if the input DataFrame is empty,
             or if the ID column is not found in the records.
         """
@@ -860,41 +1034,48 @@ class API:
         # Fill any NaN values in the DataFrame with empty strings
         records = records.fillna('').astype(str)
 
-        access_requests_needed = False  # Flag to track if access requests are needed
-        suppress_log = False  # Flag to suppress logging for specific cases
+        # Build the table resource and the prefix of each record's resource once for all records
+        table_resource = f"/ws/schema/table/{table_name}"
+        record_resource_prefix = f"{table_resource}/"
 
         # Define a function to update a single record
-        def update_records(row):
-            nonlocal access_requests_needed
-            nonlocal suppress_log
-
-            # Convert the row to JSON format, excluding the ID column
-            row_json = row.drop(id_column_name).to_json()
+        def update_record(id_row: tuple[str, dict], suppress_log: bool) -> tuple[int, str]:
+            record_id, row = id_row
 
-            # Create the payload for the API request with the correct formatting
-            payload = f'{{"tables":{{"{table_name}":{row_json}}}}}'
+            # Convert the row to a JSON payload formatted for the API request
+            payload = self._table_build_payload(table_name, row)
 
             # Send a PUT request to update the record in the specified table
-            response = self._request('put',
-                                     resource=f"/ws/schema/table/{table_name}/"
-                                              f"{row[id_column_name]}",
+            response = self._request('put', resource=record_resource_prefix + record_id,
                                      read_only=False, suppress_log=suppress_log, data=payload)
 
-            suppress_log = True  # Suppress further logging after the first request
+            # Return the response status code and text for tracking. The text is only read for
+            # errors, since successful responses are not inspected.
+            return response.status_code, response.text if response.status_code >= 400 else ''
+
+        # Split the ID column from the payload columns once for all rows. A DataFrame with no
+        # payload columns converts to an empty list, so build an empty payload for each ID.
+        ids = records[id_column_name].tolist()
 
-            # Check if access requests are needed based on the response status code
-            if response.status_code == 403 and not access_requests_needed:
-                access_requests_needed = True
+        if len(records.columns) > 1:
+            rows = records.drop(columns=[id_column_name]).to_dict(orient='records')
+
+        else:
+            rows = [{} for _ in ids]
 
-            # Store the response status code and text in the row for tracking
-            row['response_status_code'] = response.status_code
-            row['response_text'] = response.text
+        # Send the update requests for each row in the DataFrame, keeping rows that share an ID in
+        # input order
+        statuses, texts = self._records_request(update_record, list(zip(ids, rows)),
+                                                key=operator.itemgetter(0))
 
-            # Return the updated row
-            return row
+        # Check if access requests are needed based on the response status codes
+        access_requests_needed = 403 in statuses
 
-        # Apply the update_records function to each row in the DataFrame
-        results = records.apply(update_records, axis=1)
+        # Store the response status codes and texts in the records, which are already a copy of
+        # the input DataFrame, for tracking
+        records['response_status_code'] = statuses
+        records['response_text'] = texts
+        results = records
 
         # Identify rows where the response status code indicates failure (not 200)
         errors = results.loc[results['response_status_code'] != 200]
@@ -967,53 +1148,59 @@ class API:
         # Fill any NaN values in the DataFrame with empty strings
         records = records.fillna('').astype(str)
 
-        access_requests_needed = False  # Flag to track if access requests are needed
-        suppress_log = False  # Flag to suppress logging for specific cases
+        # Build the table resource and the prefix of each record's resource once for all records
+        table_resource = f"/ws/schema/table/{table_name}"
+        record_resource_prefix = f"{table_resource}/"
 
         # Define a function to update a single record
-        def update_records(row):
-            nonlocal access_requests_needed
-            nonlocal suppress_log
+        def update_record(id_row: tuple[str, dict], suppress_log: bool) -> tuple[int, str]:
+            record_id, row = id_row
 
-            # Convert the row to JSON format, excluding the ID column
-            row_json = row.drop(id_column_name).to_json()
-
-            # Create the payload for the API request with the correct formatting
-            payload = f'{{"tables":{{"{table_name}":{row_json}}}}}'
+            # Convert the row to a JSON payload formatted for the API request
+            payload = self._table_build_payload(table_name, row)
 
             # Send a PUT request to update the record in the specified table
-            response = self._request('put',
-                                     resource=f"/ws/schema/table/{table_name}/"
-                                              f"{row[id_column_name]}",
+            response = self._request('put', resource=record_resource_prefix + record_id,
                                      read_only=False, suppress_log=suppress_log, data=payload)
 
-            # Check if access requests are needed based on the response status code
-            if response.status_code == 403 and not access_requests_needed:
-                access_requests_needed = True
-
             # If the record was not found, attempt to insert it
             if response.status_code == 404:
                 # If the ID column name is the same as the foreign key column name, add that column
                 # back to the payload
                 if id_column_name == fk_column_name:
-                    row_json = row.to_json()
-                    payload = f'{{"tables":{{"{table_name}":{row_json}}}}}'
+                    payload = self._table_build_payload(table_name,
+                                                        {id_column_name: record_id, **row})
+
+                response = self._request('post', resource=table_resource, read_only=False,
+                                         suppress_log=suppress_log, data=payload)
+
+            # Return the response status code and text for tracking. The text is kept for every
+            # response, since the POST that inserts a missing record returns the new record's ID.
+            return response.status_code, response.text
+
+        # Split the ID column from the payload columns once for all rows. A DataFrame with no
+        # payload columns converts to an empty list, so build an empty payload for each ID.
+        ids = records[id_column_name].tolist()
 
-                response = self._request('post', resource=f"/ws/schema/table/{table_name}",
-                                         read_only=False, suppress_log=suppress_log, data=payload)
+        if len(records.columns) > 1:
+            rows = records.drop(columns=[id_column_name]).to_dict(orient='records')
 
-            # Suppress further logging after the first request
-            suppress_log = True
+        else:
+            rows = [{} for _ in ids]
 
-            # Store the response status code and text in the row for tracking
-            row['response_status_code'] = response.status_code
-            row['response_text'] = response.text
+        # Send the update requests for each row in the DataFrame, keeping rows that share an ID in
+        # input order
+        statuses, texts = self._records_request(update_record, list(zip(ids, rows)),
+                                                key=operator.itemgetter(0))
 
-            # Return the updated row
-            return row
+        # Check if access requests are needed based on the response status codes
+        access_requests_needed = 403 in statuses
 
-        # Apply the update_records function to each row in the DataFrame
-        results = records.apply(update_records, axis=1)
+        # Store the response status codes and texts in the records, which are already a copy of
+        # the input DataFrame, for tracking
+        records['response_status_code'] = statuses
+        records['response_text'] = texts
+        results = records
 
         # Identify rows where the response status code indicates failure (not 200)
         errors = results.loc[results['response_status_code'] != 200]
@@ -1107,7 +1294,7 @@ class API:
         -------
         pd.DataFrame
             A DataFrame containing the results of the delete operations, including response
-            status codes and texts.
+            status codes and, for failed operations, response texts.
             Returns an empty DataFrame if the API is not connected or if the input DataFrame is
             empty.
         """
@@ -1129,35 +1316,28 @@ class API:
         # Log the attempt to delete records from the specified table
         self._log.debug(f"Deleting records from {table_name}")
 
-        access_requests_needed = False  # Flag to track if access requests are needed
-        suppress_log = False  # Flag to suppress logging for specific cases
+        # Build the prefix of each record's resource once for all records
+        record_resource_prefix = f"/ws/schema/table/{table_name}/"
 
         # Define a function to delete a single record
-        def delete_records(row):
-            nonlocal access_requests_needed
-            nonlocal suppress_log
-
-            # Send a DELETE request to remove the record identified by the ID column
-            response = self._request('delete',
-                                     resource=f"/ws/schema/table/{table_name}/"
-                                              f"{row[id_column_name]}",
+        def delete_record(record_id: str | int, suppress_log: bool) -> tuple[int, str]:
+            # Send a DELETE request to remove the record with the given ID
+            response = self._request('delete', resource=record_resource_prefix + str(record_id),
                                      read_only=False, suppress_log=suppress_log)
 
-            suppress_log = True  # Suppress further logging after the first request
-
-            # Check if access requests are needed based on the response status code
-            if response.status_code == 403 and not access_requests_needed:
-                access_requests_needed = True
+            # Return the response status code and text for tracking. The text is only read for
+            # errors, since successful responses are not inspected.
+            return response.status_code, response.text if response.status_code >= 400 else ''
 
-            # Store the response status code and text in the row for tracking
-            row['response_status_code'] = response.status_code
-            row['response_text'] = response.text
+        # Send the delete requests for each record ID in the DataFrame
+        statuses, texts = self._records_request(delete_record,
+                                                records[id_column_name].tolist())
 
-            # Return the updated row
-            return row
+        # Check if access requests are needed based on the response status codes
+        access_requests_needed = 403 in statuses
 
-        # Apply the delete_records function to each row in the DataFrame
-        results = records.apply(delete_records, axis=1)
+        # Store the response status codes and texts in the results for tracking
+        results = records.assign(response_status_code=statuses, response_text=texts)
 
         # Identify rows where the response status code indicates failure (not 204)
         errors = results.loc[results['response_status_code'] != 204]
@@ -1440,17 +1620,11 @@ class API:
             # Return an empty DataFrame if the email column is not found
             return pd.DataFrame()
 
-        # Define a function to build a contact_info dictionary for each row
-        def build_contact_info(row):
-            # Add the email address to the contact_info dictionary
-            row['contact_info'] = dict(email=row['email'])
-
-            # Return the updated row
-            return row
-
-        # Apply the build_contact_info function to each row in the DataFrame and
-        # drop the email column
-        email_addresses = email_addresses.apply(build_contact_info, axis=1).drop(columns=['email'])
+        # Build a contact_info dictionary containing the email address for each row and drop the
+        # email column
+        email_addresses = email_addresses.assign(
+                contact_info=[dict(email=email) for email in email_addresses['email']]).drop(
+                columns=['email'])
 
         # Convert the DataFrame to a JSON string for the API payload
         payload = self._students_build_update_payload(email_addresses)
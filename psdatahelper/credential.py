@@ -1,14 +1,36 @@
+import atexit
 import json
 import keyring as kr
-import re
 import getpass
+import threading
+import time
 from .log import Log
 from enum import Enum
 from requests_oauthlib import OAuth2Session
 from oauthlib.oauth2 import BackendApplicationClient
 from oauthlib.oauth2.rfc6749.errors import InvalidClientError
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
+# Cache of API credential fields loaded or stored in this process, keyed by server name and plugin
+_CRED_CACHE: dict[tuple[str, str], dict] = {}
+
+# Cache of the JSON last written to secure storage, keyed by server name and plugin
+_CRED_CACHE_BLOB: dict[tuple[str, str], str] = {}
+
+# Number of seconds before expiry that a stored access token is no longer reused
+_TOKEN_EXPIRY_SKEW = 60
+
+# Number of seconds before expiry that the access token is refreshed in the background
+_TOKEN_REFRESH_LEAD = 300
+
+# Number of seconds to wait before retrying a failed access token refresh
+_TOKEN_REFRESH_RETRY_DELAY = 30
+
+# Background token refresh timers, one per server address and plugin, and the lock guarding them
+_REFRESH_TIMERS: dict[tuple[str, str], threading.Timer] = {}
+_REFRESH_TIMERS_LOCK = threading.Lock()
+
 
 class CredentialType(Enum):
     """
@@ -39,14 +61,29 @@ class Credential:
         A dictionary to store credential fields.
     loaded : bool
         Indicates if the credentials have been successfully loaded.
+    token_expires_at : float
+        The time at which the access token expires, in seconds since the epoch (0 if unknown).
 
     Methods
     -------
     __repr__()
         Return a string representation of the Credential object.
+    token_refresh_due()
+        Check if the access token is close to expiring and may be refreshed.
+    refresh_access_token()
+        Obtain a new access token and store the updated credentials.
+    close()
+        Cancel the background access token refresh scheduled by this instance.
     """
 
-    def __init__(self, server_address: str, plugin: str, cred_type=CredentialType.API, log=Log('credential')):
+    # OAuth2 sessions used for token requests, shared by credentials with the same server and client ID, each
+    # with the lock that serializes token requests made through it
+    _SESSIONS: dict[tuple[str, str], tuple[OAuth2Session, threading.Lock]] = {}
+
+    # Lock guarding additions to the shared sessions
+    _SESSIONS_LOCK = threading.Lock()
+
+    def __init__(self, server_address: str, plugin: str, cred_type=CredentialType.API, log: Log | None = None):
         """
         Initialize the Credential instance.
 
@@ -59,9 +96,13 @@ class Credential:
         cred_type : CredentialType, optional
             The type of credentials (default is CredentialType.API, which represents PowerSchool API credentials).
         log : Log, optional
-            The Log instance to use for logging (default is Log('credential')).
+            The Log instance to use for logging (default is None, which uses Log('credential')).
         """
 
+        # Create the default log when no log instance is provided
+        if log is None:
+            log = Log('credential')
+
         # Log an error if the server address is not provided
         if not server_address:
             log.error("Server address not provided. Unable to load credentials.")
@@ -73,6 +114,10 @@ class Credential:
         self._cred_type = cred_type
         self._log = log
         self._session = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer = None
+        self._next_refresh_attempt = 0.0
+        self._closed = False
 
         # Initialize public attributes
         self.plugin = plugin
@@ -81,17 +126,8 @@ class Credential:
         self.fields = {}
         self.loaded = False
 
-        # Check the credential type and initialize the credentials accordingly
-        match self._cred_type:
-            case CredentialType.API:
-                self._initialize_api_credentials()
-
-            case CredentialType.ODBC:
-                self._initialize_odbc_credentials()
-
-            # Log an error if an invalid credential type is specified
-            case _:
-                self._log.error("Invalid credential type specified")
+        # Look up the initializer for the credential type and initialize the credentials accordingly
+        Credential._INITIALIZERS.get(self._cred_type, Credential._initialize_invalid_credentials)(self)
 
     def __repr__(self):
         """
@@ -113,6 +149,84 @@ class Credential:
             # Return a simpler representation for ODBC credentials
             return f"Credential(server_name='{self.server_name}', cred_type='{self._cred_type}')"
 
+    @property
+    def token_expires_at(self) -> float:
+        """
+        The time at which the access token expires, in seconds since the epoch (0 if unknown).
+        """
+
+        return self.fields.get('expires_at') or 0.0
+
+    def token_refresh_due(self) -> bool:
+        """
+        Check if the access token is close to expiring and may be refreshed.
+
+        Returns
+        -------
+        bool
+            True if the access token expires within the expiry skew and no failed refresh is
+            waiting to be retried; False otherwise.
+        """
+
+        # Check if the token expiry is known, the token is close to expiring and the wait after a
+        # failed refresh has passed
+        return (bool(self.token_expires_at) and
+                time.time() >= self.token_expires_at - _TOKEN_EXPIRY_SKEW and
+                time.monotonic() >= self._next_refresh_attempt)
+
+    def refresh_access_token(self) -> bool:
+        """
+        Obtain a new access token and store the updated credentials.
+
+        Returns
+        -------
+        bool
+            True if a new access token was obtained; False otherwise.
+        """
+
+        # Prevent a background refresh and a caller's refresh from running at the same time
+        with self._refresh_lock:
+            # Skip the request while a failed refresh is waiting to be retried
+            if time.monotonic() < self._next_refresh_attempt:
+                return False
+
+            # Request a new access token, keeping the current one if the request fails and waiting
+            # before trying again
+            if not self._get_api_access_token():
+                self._next_refresh_attempt = time.monotonic() + _TOKEN_REFRESH_RETRY_DELAY
+
+                return False
+
+            # Store the credentials with the new access token
+            self._save_api_credentials()
+
+            # Schedule the next background refresh for the new access token
+            self._schedule_token_refresh()
+
+        return True
+
+    def close(self):
+        """
+        Cancel the background access token refresh scheduled by this instance.
+        """
+
+        # Skip if the instance was not fully initialized
+        if not hasattr(self, '_closed'):
+            return
+
+        with _REFRESH_TIMERS_LOCK:
+            # Prevent a refresh that is already running from scheduling another one
+            self._closed = True
+
+            # Cancel the pending refresh and remove it from the shared timers
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+
+                if _REFRESH_TIMERS.get((self.server_address, self.plugin)) is self._refresh_timer:
+                    del _REFRESH_TIMERS[(self.server_address, self.plugin)]
+
+                self._refresh_timer = None
+
     def _initialize_api_credentials(self):
         # Log an error if the plugin name is not provided
         if not self.plugin:
@@ -121,15 +235,20 @@ class Credential:
             return
 
         # Clean up the server address by removing protocol and trailing slashes
-        self.server_address = re.sub(r"^https?://", "", self.server_address)
-        self.server_address = re.sub(r"/+$", "", self.server_address)
-        self.server_address = f"https://{self.server_address}"
+        address = self.server_address.removeprefix("https://")
+
+        if address == self.server_address:
+            address = address.removeprefix("http://")
+
+        self.server_address = f"https://{address.rstrip('/')}"
 
         # Define required API fields
         api_fields = {
             'client_id':     None,
             'client_secret': None,
-            'access_token':  None
+            'access_token':  None,
+            'expires_at':    None,
+            'refresh_token': None
         }
 
         # Update the fields dictionary with API fields
@@ -140,30 +259,95 @@ class Credential:
 
         # Check if client ID and secret are provided
         if self.fields['client_id'] and self.fields['client_secret']:
-            self._get_api_access_token()
+            # Reuse the stored access token if it is not close to expiring, otherwise obtain a new
+            # one
+            if (self.fields['access_token'] and
+                    time.time() < self.token_expires_at - _TOKEN_EXPIRY_SKEW):
+                self._log.debug("Stored access token is still valid")
+
+            else:
+                self._get_api_access_token()
 
             # If access token is obtained, save credentials and mark as loaded
             if self.fields['access_token']:
                 self._save_api_credentials()
                 self.loaded = True
 
+                # Refresh the access token in the background before it expires
+                self._schedule_token_refresh()
+
         else:
             # Log an error if client ID or secret is missing
             self._log.error("Client ID or client secret not provided. Unable to store credentials.")
 
+    def _schedule_token_refresh(self):
+        # Skip scheduling if the token expiry is unknown
+        if not self.token_expires_at:
+            return
+
+        # Refresh ahead of expiry, but never sooner than halfway through the token's remaining
+        # lifetime so that short-lived tokens are not refreshed continuously
+        remaining = self.token_expires_at - time.time()
+        self._start_refresh_timer(max(remaining - _TOKEN_REFRESH_LEAD, remaining / 2, 0.0))
+
+    def _start_refresh_timer(self, delay: float):
+        cache_key = (self.server_address, self.plugin)
+
+        with _REFRESH_TIMERS_LOCK:
+            # Skip scheduling once the instance has been closed
+            if self._closed:
+                return
+
+            # Cancel the refresh scheduled for the same server and plugin, by this or any other
+            # instance, so that only one timer refreshes each token
+            previous_timer = _REFRESH_TIMERS.get(cache_key)
+
+            if previous_timer is not None:
+                previous_timer.cancel()
+
+            # Start a daemon timer so a pending refresh does not keep the process alive
+            self._refresh_timer = threading.Timer(delay, self._refresh_in_background)
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+            _REFRESH_TIMERS[cache_key] = self._refresh_timer
+
+        self._log.debug("Access token refresh scheduled in %.0f seconds", delay)
+
+    def _refresh_in_background(self):
+        # Refresh the access token, which schedules the next refresh, or try again later if the
+        # refresh fails
+        if not self.refresh_access_token():
+            self._start_refresh_timer(_TOKEN_REFRESH_RETRY_DELAY)
+
     def _initialize_odbc_credentials(self):
         # Log an error to indicate ODBC credentials are not yet implemented
         self._log.error("ODBC credential type not yet implemented")
 
+    def _initialize_invalid_credentials(self):
+        # Log an error if an invalid credential type is specified
+        self._log.error("Invalid credential type specified")
+
     def _load_api_credentials(self):
-        # Attempt to load API credentials from a secure storage
-        try:
-            self.fields.update(json.loads(kr.get_password(self.server_name, self.plugin)))
+        # Use the credentials already loaded in this process to avoid a secure storage lookup
+        cache_key = (self.server_name, self.plugin)
+        cached_fields = _CRED_CACHE.get(cache_key)
+
+        if cached_fields is not None:
+            self.fields.update(cached_fields)
 
-        except Exception:
-            # Log a debug message if no credentials are found for the specified plugin
-            self._log.debug(f"No credentials found for plugin {self.plugin} on "
-                            f"{self.server_address}.")
+        else:
+            # Attempt to load API credentials from a secure storage
+            try:
+                blob = kr.get_password(self.server_name, self.plugin)
+                self.fields.update(json.loads(blob))
+
+                # Remember the stored JSON so that saving unchanged credentials skips the write
+                _CRED_CACHE_BLOB[cache_key] = blob
+
+            except Exception:
+                # Log a debug message if no credentials are found for the specified plugin
+                self._log.debug("No credentials found for plugin %s on %s.", self.plugin,
+                                self.server_address)
 
         # Check if client_id and client_secret are missing
         if not self.fields['client_id'] or not self.fields['client_secret']:
@@ -180,44 +364,127 @@ class Credential:
                                     f"Please enter: "))
 
             # Store the entered credentials securely
-            kr.set_password(self.server_name, self.plugin, json.dumps(self.fields))
+            kr.set_password(self.server_name, self.plugin, json.dumps(self.fields, separators=(',', ':')))
             # Log a debug message indicating that credentials have been stored
             self._log.debug("Credentials stored")
 
     def _save_api_credentials(self):
+        cache_key = (self.server_name, self.plugin)
+
+        # Cache the credentials for other Credential instances in this process, whether or not they
+        # need to be written to secure storage
+        _CRED_CACHE[cache_key] = self.fields.copy()
+
+        # Serialize the API credentials compactly to reduce the data written to secure storage
+        blob = json.dumps(self.fields, separators=(',', ':'))
+
+        # Skip the secure storage write if the credentials have not changed since the last write
+        if blob == _CRED_CACHE_BLOB.get(cache_key):
+            self._log.debug("Credentials unchanged")
+
+            return
+
         # Store the API credentials securely using the specified server name and plugin
-        kr.set_password(self.server_name, self.plugin, json.dumps(self.fields))
+        kr.set_password(self.server_name, self.plugin, blob)
+        _CRED_CACHE_BLOB[cache_key] = blob
 
         # Log a debug message indicating that the credentials have been successfully stored
         self._log.debug("Credentials stored")
 
-    def _get_api_access_token(self):
+    def _get_api_access_token(self) -> bool:
         # Log the attempt to open a session for obtaining the access token
-        self._log.debug(f"Opening session for {self.server_name} to obtain access token")
+        self._log.debug("Opening session for %s to obtain access token", self.server_name)
 
-        # Create an OAuth2 session using the client ID from the stored fields
-        self._session = OAuth2Session(client=BackendApplicationClient(client_id=self.fields['client_id']))
+        # Reuse the OAuth2 session, and its open connections, of any credential in this process with
+        # the same server and client ID
+        session_key = (self.server_address, self.fields['client_id'])
 
-        try:
-            # Fetch the access token from the specified token URL using HTTP Basic Authentication
-            response = self._session.fetch_token(
-                    token_url=f"{self.server_address}/oauth/access_token",
-                    auth=HTTPBasicAuth(self.fields['client_id'], self.fields['client_secret'])
-            )
+        with Credential._SESSIONS_LOCK:
+            cached_session = Credential._SESSIONS.get(session_key)
 
-        except InvalidClientError as e:
-            # Log an error if there is an invalid client error during token fetching
-            self._log.error(f"Invalid client error: {e}")
+            if cached_session is None:
+                # Create an OAuth2 session using the client ID from the stored fields
+                session = OAuth2Session(client=BackendApplicationClient(client_id=self.fields['client_id']))
 
-        except Exception as e:
-            # Log any other errors that occur while fetching the token
-            self._log.error(f"Error fetching token: {e}")
+                # Keep a small connection pool for token requests to the server
+                session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+                cached_session = (session, threading.Lock())
+                Credential._SESSIONS[session_key] = cached_session
+
+        self._session, session_lock = cached_session
+
+        # Flag to track if the access token was obtained
+        token_obtained = False
+
+        # Serialize token requests made through the shared session, which stores the token it obtains
+        with session_lock:
+            try:
+                response = None
+
+                # Refresh the access token with the stored refresh token, if the server issued one
+                if self.fields['refresh_token']:
+                    try:
+                        response = self._session.refresh_token(
+                                token_url=f"{self.server_address}/oauth/access_token",
+                                refresh_token=self.fields['refresh_token'],
+                                auth=HTTPBasicAuth(self.fields['client_id'],
+                                                   self.fields['client_secret'])
+                        )
+
+                    except Exception as e:
+                        # Log a debug message, discard the rejected refresh token and fall back to
+                        # fetching a new access token
+                        self._log.debug("Unable to refresh access token: %s", e)
+                        self.fields['refresh_token'] = None
+
+                # Fetch the access token from the specified token URL using HTTP Basic Authentication
+                if response is None:
+                    response = self._session.fetch_token(
+                            token_url=f"{self.server_address}/oauth/access_token",
+                            auth=HTTPBasicAuth(self.fields['client_id'], self.fields['client_secret'])
+                    )
+
+            except InvalidClientError as e:
+                # Log an error if there is an invalid client error during token fetching
+                self._log.error(f"Invalid client error: {e}")
+
+            except Exception as e:
+                # Log any other errors that occur while fetching the token
+                self._log.error(f"Error fetching token: {e}")
+
+            else:
+                # Store the obtained access token in the fields
+                self.fields['access_token'] = response['access_token']
+
+                # Store the token expiry time and refresh token, if the server provided them. A
+                # refresh response may omit the refresh token, in which case the current one is kept.
+                self.fields['expires_at'] = response.get('expires_at')
+                self.fields['refresh_token'] = response.get('refresh_token',
+                                                            self.fields['refresh_token'])
+
+                # Log a debug message indicating that the access token has been successfully obtained
+                self._log.debug("Access token obtained")
+
+                token_obtained = True
+
+        return token_obtained
+
+    # Initializers for each credential type
+    _INITIALIZERS = {
+        CredentialType.API:  _initialize_api_credentials,
+        CredentialType.ODBC: _initialize_odbc_credentials
+    }
+
+    @staticmethod
+    def _close_sessions():
+        # Close the shared OAuth2 sessions and their connections
+        with Credential._SESSIONS_LOCK:
+            for session, _ in Credential._SESSIONS.values():
+                session.close()
+
+            Credential._SESSIONS.clear()
 
-        else:
-            # Store the obtained access token in the fields
-            self.fields['access_token'] = response['access_token']
-            # Log a debug message indicating that the access token has been successfully obtained
-            self._log.debug("Access token obtained")
 
-        # Close the session after the operation is complete
-        self._session.close()
+# Close the shared OAuth2 sessions when the program exits
+atexit.register(Credential._close_sessions)
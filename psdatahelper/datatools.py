@@ -8,12 +8,13 @@ class DataTools:
 
     Methods
     -------
-    reorder_columns(df, columns, inserted_column_fill=np.nan)
+    reorder_columns(df, columns, inserted_column_fill=np.nan, copy=True)
         Reorder the columns of a DataFrame and insert missing columns with a specified fill value.
     """
 
     @staticmethod
-    def reorder_columns(df: pd.DataFrame, columns: list[str], inserted_column_fill: any = np.nan) -> pd.DataFrame:
+    def reorder_columns(df: pd.DataFrame, columns: list[str], inserted_column_fill: any = np.nan,
+                        copy: bool = True) -> pd.DataFrame:
         """
         Reorder the columns of a DataFrame and insert missing columns with a specified fill value.
 
@@ -26,21 +27,33 @@ class DataTools:
         inserted_column_fill : any, optional
             The value to fill in for inserted columns that are not present in the original DataFrame (default
             is np.nan, which is a null value).
+        copy : bool, optional
+            Whether to return a copy when the DataFrame's columns already match the specified order (default is
+            True). If False, the input DataFrame itself is returned in that case.
 
         Returns
         -------
         pd.DataFrame
-            A new DataFrame with columns reordered and missing columns filled with the specified value.
+            A DataFrame with columns reordered and missing columns filled with the specified value.
         """
 
-        # Create a copy of the original DataFrame to avoid modifying it
-        return_df = df.copy()
+        # Skip reordering if the columns already match the specified order
+        if list(df.columns) == list(columns):
+            return df.copy() if copy else df
+
+        # reindex cannot handle duplicate column labels, so for those copy the DataFrame and add missing columns
+        # one at a time
+        if df.columns.has_duplicates:
+            return_df = df.copy()
 
-        # Iterate through the desired column order
-        for column in columns:
             # Add missing columns with the specified fill value
-            if column not in df.columns:
-                return_df.loc[:, column] = inserted_column_fill
+            for column in columns:
+                if column not in df.columns:
+                    return_df.loc[:, column] = inserted_column_fill
+
+            # Return the DataFrame with columns reordered according to the specified order
+            return return_df.loc[:, columns]
 
-        # Return the DataFrame with columns reordered according to the specified order
-        return return_df.loc[:, columns]
+        # Build a new DataFrame with columns in the specified order, adding missing columns with the specified
+        # fill value
+        return df.reindex(columns=columns, fill_value=inserted_column_fill)
@@ -1,10 +1,175 @@
+import atexit
 import logging
-import smtplib
-from io import StringIO
+import logging.handlers
+import queue
+import threading
+from . import _smtp
+from collections import deque
 from email.utils import formataddr
 from email.message import EmailMessage
 
 
+class _TextBuffer:
+    """
+    A file-like buffer that keeps the most recent messages written to it.
+
+    Methods
+    -------
+    write(s)
+        Append a message to the buffer, discarding the oldest message if the buffer is full.
+    flush()
+        Do nothing; provided for compatibility with logging.StreamHandler.
+    getvalue()
+        Return the buffered messages as a single string.
+    """
+
+    def __init__(self, max_messages: int):
+        """
+        Initialize the _TextBuffer instance.
+
+        Parameters
+        ----------
+        max_messages : int
+            The maximum number of messages to keep.
+        """
+
+        # Store messages in a deque that drops the oldest message once it is full
+        self._messages = deque(maxlen=max_messages)
+
+    def write(self, s: str):
+        """
+        Append a message to the buffer, discarding the oldest message if the buffer is full.
+
+        Parameters
+        ----------
+        s : str
+            The message to append.
+        """
+
+        self._messages.append(s)
+
+    def flush(self):
+        """
+        Do nothing; provided for compatibility with logging.StreamHandler.
+        """
+
+        pass
+
+    def getvalue(self) -> str:
+        """
+        Return the buffered messages as a single string.
+
+        Returns
+        -------
+        str
+            The buffered messages joined in the order they were written.
+        """
+
+        return ''.join(self._messages)
+
+
+class _CachingFormatter(logging.Formatter):
+    """
+    A formatter that formats each record's time once and reuses it for every handler that formats
+    the record.
+    """
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        """
+        Return the record's creation time as formatted text, reusing the text formatted by an
+        earlier handler.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The record whose time is formatted.
+        datefmt : str, optional
+            The date format to use (default is None, which uses the ISO 8601 format).
+
+        Returns
+        -------
+        str
+            The formatted creation time.
+        """
+
+        # Reuse the time formatted for this record if it was formatted with the same date format
+        cached = getattr(record, '_formatted_time', None)
+
+        if cached is not None and cached[0] == datefmt:
+            return cached[1]
+
+        # Format the time and store it on the record for the other handlers
+        formatted_time = super().formatTime(record, datefmt)
+        record._formatted_time = (datefmt, formatted_time)
+
+        return formatted_time
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """
+    A queue listener that can be stopped more than once.
+
+    Methods
+    -------
+    stop()
+        Stop the listener if it is running, writing the messages still waiting in the queue.
+    """
+
+    def stop(self):
+        """
+        Stop the listener if it is running, writing the messages still waiting in the queue.
+        """
+
+        # Skip if the listener has already been stopped
+        if self._thread is not None:
+            super().stop()
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    A file handler that writes through a large buffer instead of flushing the log file after every
+    message.
+
+    Critical messages are flushed immediately. Other messages are written when the buffer fills,
+    when flush() is called, or when the handler is closed.
+    """
+
+    # Size of the log file write buffer in bytes
+    BUFFER_SIZE = 64 * 1024
+
+    def _open(self):
+        # Open the log file with a large write buffer
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord):
+        """
+        Write a message to the log file buffer, flushing it only for critical messages.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The record to write.
+        """
+
+        # Open the log file on the first message
+        if self.stream is None:
+            self.stream = self._open()
+
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+
+            # Write critical messages to disk straight away
+            if record.levelno >= logging.CRITICAL:
+                self.flush()
+
+        except RecursionError:
+            raise
+
+        except Exception:
+            self.handleError(record)
+
+
 class Log:
     """
     A class used to handle logging and error reporting.
@@ -13,8 +178,9 @@ class Log:
     ----------
     has_errors : bool
         Indicates if any errors have been logged.
-    text : StringIO
-        Contains all the messages logged in the current session.
+    text : _TextBuffer
+        Contains the most recent messages logged in the current session; use text.getvalue() to
+        retrieve them.
 
     Methods
     -------
@@ -38,9 +204,17 @@ class Log:
         Log an exception with severity 'ERROR' and set has_errors to True.
     send_error_report()
         Send an error report via email if any errors have been logged.
+    close()
+        Write all pending messages and stop writing messages to the log file and console.
     """
 
-    def __init__(self, log_file_name: str, debug=False):
+    # Buffered file handlers shared by all Log instances with the same log file name
+    _FILE_HANDLERS: dict[str, _BufferedFileHandler] = {}
+
+    # Background listeners writing messages to the log file and console, by logger name
+    _LISTENERS: dict[str, _QueueListener] = {}
+
+    def __init__(self, log_file_name: str, debug=False, max_text_messages: int = 10000):
         """
         Initialize the Log instance.
 
@@ -50,6 +224,9 @@ class Log:
             The name of the log file without any file extension.
         debug : bool, optional
             If True, set the log level to DEBUG. Otherwise, set it to ERROR (default is False).
+        max_text_messages : int, optional
+            The maximum number of messages kept in text for the error report (default is 10000).
+            Once reached, the oldest messages are discarded.
         """
 
         # Set the log file name and debug mode
@@ -58,25 +235,44 @@ class Log:
 
         # Initialize error tracking and text storage
         self.has_errors = False
-        self.text = StringIO()
+        self.text = _TextBuffer(max_text_messages)
 
         # Create a logger with the specified name
         self._logger = logging.getLogger(log_file_name)
 
         # Define the log message format
-        self._formatter = logging.Formatter("{levelname}: {asctime} - {message}", style="{",
+        self._formatter = _CachingFormatter("{levelname}: {asctime} - {message}", style="{",
                                             datefmt="%b %d %Y %I:%M:%S %p")
 
-        # Set up file and stream handlers for logging
-        self._file_handler = logging.FileHandler(f"{self._file_name}", mode="a")
+        # Reuse the file handler of an earlier Log with the same name, so that its log file is not
+        # opened again
+        self._file_handler = Log._FILE_HANDLERS.get(self._file_name)
+
+        if self._file_handler is None:
+            # Otherwise set up a buffered file handler, deferring opening the log file until the
+            # first message is written to it
+            self._file_handler = _BufferedFileHandler(f"{self._file_name}", mode="a", delay=True)
+            Log._FILE_HANDLERS[self._file_name] = self._file_handler
+
+            # Write any buffered messages to the log file when the program exits
+            atexit.register(self._file_handler.flush)
+
+        # Stop the listener of an earlier Log with the same name, writing its pending messages
+        # before the shared file handler's level and formatter are changed below
+        previous_listener = Log._LISTENERS.pop(log_file_name, None)
+
+        if previous_listener is not None:
+            previous_listener.stop()
+            atexit.unregister(previous_listener.stop)
+
+        # Set up a stream handler to capture the messages logged by this instance
         self._text_handler = logging.StreamHandler(stream=self.text)
 
         # Prevent log messages from being propagated to the root logger
         self._logger.propagate = False
 
-        # Clear existing handlers if any
-        if self._logger.hasHandlers():
-            self._logger.handlers.clear()
+        # Clear any existing handlers directly, without walking the logger hierarchy
+        self._logger.handlers[:] = []
 
         # Configure logging levels based on debug mode
         if self._debug:
@@ -84,11 +280,10 @@ class Log:
             self._file_handler.setLevel(logging.DEBUG)
             self._text_handler.setLevel(logging.DEBUG)
 
-            # Add console handler for debug output
+            # Set up console handler for debug output
             self._console_handler = logging.StreamHandler()
             self._console_handler.setLevel(logging.DEBUG)
             self._console_handler.setFormatter(self._formatter)
-            self._logger.addHandler(self._console_handler)
 
         else:
             self._logger.setLevel(logging.ERROR)
@@ -99,9 +294,25 @@ class Log:
         self._file_handler.setFormatter(self._formatter)
         self._text_handler.setFormatter(self._formatter)
 
-        # Add the handlers to the logger
-        self._logger.addHandler(self._file_handler)
+        # Write messages to the log file, and console in debug mode, on a background thread so that
+        # logging does not wait on I/O
+        log_queue = queue.SimpleQueue()
+        self._listener = _QueueListener(
+                log_queue, self._file_handler, *((self._console_handler,) if self._debug else ()),
+                respect_handler_level=True)
+        self._listener.start()
+        self._listener_lock = threading.Lock()
+        Log._LISTENERS[log_file_name] = self._listener
+
+        # Write pending messages when the program exits
+        atexit.register(self._listener.stop)
+
+        # Add the handlers to the logger, keeping the text handler on the calling thread so that
+        # text is always complete. The text handler comes first so that the time it formats is
+        # passed along with each record to the file and console handlers.
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
         self._logger.addHandler(self._text_handler)
+        self._logger.addHandler(self._queue_handler)
 
         # Initialize SMTP server and email header information
         self._smtp_server = ''
@@ -137,8 +348,8 @@ class Log:
         self._email_header['recipients'] = recipients
 
         # Log the updated email configuration for debugging purposes
-        self._logger.debug(f"Email configuration set.\n\tSMTP Server: {self._smtp_server}\n\tEmail Header: "
-                           f"{self._email_header}")
+        self._logger.debug("Email configuration set.\n\tSMTP Server: %s\n\tEmail Header: %s",
+                           self._smtp_server, self._email_header)
 
     def set_formatter(self, formatter: logging.Formatter):
         """
@@ -304,13 +515,13 @@ class Log:
             If there is an error sending the error report email.
         """
 
-        # Check if there are any errors to report
+        # If no errors are logged, return without sending an email
         if not self.has_errors:
-            self._logger.debug("No errors to report")
-
-            # If no errors are logged, return without sending an email
             return
 
+        # Write any pending messages to the log file
+        self._flush_file()
+
         # Ensure that an SMTP server is configured
         if not self._smtp_server:
             # Log an error if no SMTP server is specified
@@ -341,8 +552,8 @@ class Log:
         msg.set_content(self.text.getvalue())
 
         try:
-            # Send the email using SMTP
-            with smtplib.SMTP(self._smtp_server) as s:
+            # Send the email using a pooled SMTP connection
+            with _smtp.connection(self._smtp_server) as s:
                 s.send_message(msg)
 
         except Exception as e:
@@ -353,3 +564,38 @@ class Log:
         else:
             # Log success if the email was sent successfully
             self._logger.debug("Error report sent successfully")
+
+    def close(self):
+        """
+        Write all pending messages and stop writing messages to the log file and console.
+
+        Messages logged after closing are still captured in text.
+        """
+
+        # Stop queueing messages, since nothing reads the queue once the listener is stopped
+        self._logger.removeHandler(self._queue_handler)
+
+        # Stop the listener, which writes the messages still waiting in the queue
+        with self._listener_lock:
+            self._listener.stop()
+
+        atexit.unregister(self._listener.stop)
+
+        # Remove the listener from the registry if it belongs to this instance
+        if Log._LISTENERS.get(self._logger.name) is self._listener:
+            del Log._LISTENERS[self._logger.name]
+
+        # Write the buffered messages to the log file
+        self._file_handler.flush()
+
+    def _flush_file(self):
+        # Restart the listener to process the messages waiting in the queue, unless it was stopped
+        # by close() or replaced by a later Log with the same name
+        with self._listener_lock:
+            if (Log._LISTENERS.get(self._logger.name) is self._listener and
+                    self._listener._thread is not None):
+                self._listener.stop()
+                self._listener.start()
+
+        # Write the buffered messages to the log file
+        self._file_handler.flush()
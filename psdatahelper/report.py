@@ -1,4 +1,6 @@
-import smtplib
+import mmap
+import os
+from . import _smtp
 from .log import Log
 from email.utils import formataddr
 from email.message import EmailMessage
@@ -22,18 +24,19 @@ class Report:
         Send the report email with any attachments.
     """
 
-    def __init__(self, log=Log('reporting')):
+    def __init__(self, log: Log | None = None):
         """
         Initialize the Report instance.
 
         Parameters
         ----------
         log : Log, optional
-            The Log instance to use for logging (default is Log('reporting')).
+            The Log instance to use for logging (default is None, which uses Log('reporting')).
         """
 
-        # Store the provided log instance for logging purposes
-        self._log = log
+        # Store the provided log instance for logging purposes, creating the default log if none
+        # is provided
+        self._log = log if log is not None else Log('reporting')
 
         # Initialize email settings with default empty values
         self._email_settings = {
@@ -43,6 +46,9 @@ class Report:
             'recipients':     '',
         }
 
+        # Initialize the formatted sender for the From header
+        self._from_header = ''
+
         # Initialize email header information
         self._email_header = {
             'subject':     '',
@@ -52,6 +58,10 @@ class Report:
         # Initialize the body of the report as an empty string
         self._report_body = ''
 
+        # Initialize the message built for sending, which is reused until the sender, body or
+        # attachments change
+        self._message = None
+
         # Log a debug message indicating that the reporting instance has been initialized
         self._log.debug("Reporting initialized")
 
@@ -79,12 +89,18 @@ class Report:
         self._email_settings['sender_name'] = sender_name
         self._email_settings['recipients'] = recipients
 
+        # Format the sender for the From header once, rather than on every send
+        self._from_header = formataddr((sender_name, sender_address))
+
+        # Rebuild the message on the next send in case the sender changed
+        self._message = None
+
         # Log the updated email configuration for debugging purposes
         self._log.debug(
-            f"Email configuration set.\n\tSMTP Server: {self._email_settings['smtp_server']}\n"
-            f"\tSender address: {self._email_settings['sender_address']}\n"
-            f"\tSender name: {self._email_settings['sender_name']}\n"
-            f"\tRecipients: {self._email_settings['recipients']}")
+            "Email configuration set.\n\tSMTP Server: %s\n\tSender address: %s\n"
+            "\tSender name: %s\n\tRecipients: %s", self._email_settings['smtp_server'],
+            self._email_settings['sender_address'], self._email_settings['sender_name'],
+            self._email_settings['recipients'])
 
     def set_email_subject(self, subject: str):
         """
@@ -100,7 +116,7 @@ class Report:
         self._email_header['subject'] = subject
 
         # Log the updated email subject for debugging purposes
-        self._log.debug(f"Email subject set.\n\tSubject: {self._email_header['subject']}")
+        self._log.debug("Email subject set.\n\tSubject: %s", self._email_header['subject'])
 
     def set_report_body(self, body: str):
         """
@@ -115,6 +131,9 @@ class Report:
         # Update the report body with the provided content
         self._report_body = body
 
+        # Rebuild the message on the next send to include the new body
+        self._message = None
+
         # Log a debug message indicating that the report body has been set
         self._log.debug('Report body set.')
 
@@ -131,8 +150,11 @@ class Report:
         # Append the provided attachment file path to the list of attachments in the email header
         self._email_header['attachments'].append(attachment)
 
+        # Rebuild the message on the next send to include the new attachment
+        self._message = None
+
         # Log a debug message indicating that the attachment has been added
-        self._log.debug(f"Attachment added.\n\tAttachment: {attachment}")
+        self._log.debug("Attachment added.\n\tAttachment: %s", attachment)
 
     def send_email(self):
         """
@@ -144,62 +166,86 @@ class Report:
             If there is an error sending the report email.
         """
 
-        # Flag to track if any email settings are missing
-        bad_settings = False
-
-        # Check each email setting for completeness
-        for setting_name, setting_value in self._email_settings.items():
-            if len(setting_value) == 0:
-                bad_settings = True
-
-                # Log an error for each missing email setting
-                self._log.error(f"Email setting not set: {setting_name}")
+        # Collect the names of any missing email settings
+        missing_settings = [name for name, value in self._email_settings.items() if not value]
 
-        if bad_settings:
-            # Log an error if any email settings are missing
-            self._log.error("Report not sent due to missing email settings")
+        if missing_settings:
+            # Log a single error listing the missing email settings
+            self._log.error("Report not sent due to missing email settings: %s",
+                            ', '.join(missing_settings))
 
             # Exit the method early if any email settings are missing
             return
 
         self._log.debug("Sending report")
 
-        # Create a new EmailMessage object for the email
-        email_message = EmailMessage()
+        # Build the message, or reuse the one built for an earlier send
+        email_message = self._build_message()
 
-        # Set the email headers and content using the configured settings
-        email_message['From'] = formataddr(
-                (self._email_settings['sender_name'], self._email_settings['sender_address']))
+        # Set the recipients and subject, which can change without rebuilding the message
+        del email_message['To']
+        del email_message['Subject']
         email_message['To'] = self._email_settings['recipients']
         email_message['Subject'] = self._email_header['subject']
+
+        # Attempt to send the email using the configured SMTP server
+        try:
+            with _smtp.connection(self._email_settings['smtp_server']) as smtp:
+                smtp.send_message(email_message)
+
+        except Exception as e:
+            # Log any exceptions that occur during the sending process
+            self._log.exception(f"Error sending report: {e}")
+
+        else:
+            # Log a debug message indicating the report was sent successfully
+            self._log.debug("Report sent")
+
+    def _build_message(self) -> EmailMessage:
+        # Reuse the message built for an earlier send if the sender, body and attachments have
+        # not changed
+        if self._message is not None:
+            return self._message
+
+        # Create a new EmailMessage object for the email
+        email_message = EmailMessage()
+
+        # Set the sender and content using the configured settings
+        email_message['From'] = self._from_header
         email_message.set_content(self._report_body)
 
+        # Flag to track if any attachments could not be loaded
+        missing_attachments = False
+
         # Add any specified attachments to the email
         for attachment in self._email_header['attachments']:
             try:
-                # Open the attachment file and read its content
-                with open(attachment, 'rb') as file:
-                    email_message.add_attachment(file.read(), maintype='application',
-                                                 subtype='octet-stream',
-                                                 filename=attachment)
+                # Open the attachment file and map its content into memory, so that it is encoded
+                # straight from the file instead of from a copy. Empty files cannot be mapped.
+                with open(attachment, 'rb', buffering=0) as file:
+                    if os.fstat(file.fileno()).st_size:
+                        with (mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                              memoryview(mapped) as content):
+                            email_message.add_attachment(content, maintype='application',
+                                                         subtype='octet-stream',
+                                                         filename=attachment)
+
+                    else:
+                        email_message.add_attachment(b'', maintype='application',
+                                                     subtype='octet-stream', filename=attachment)
 
             except FileNotFoundError:
                 # Log an error if the attachment file is not found
                 self._log.error(f"Attachment not found: {attachment}")
+                missing_attachments = True
 
             else:
                 # Log a debug message indicating the attachment was loaded successfully
-                self._log.debug(f"Attachment loaded: {attachment}")
+                self._log.debug("Attachment loaded: %s", attachment)
 
-        # Attempt to send the email using the configured SMTP server
-        try:
-            with smtplib.SMTP(self._email_settings['smtp_server']) as smtp:
-                smtp.send_message(email_message)
+        # Keep the message for later sends, unless an attachment is missing and should be looked
+        # for again
+        if not missing_attachments:
+            self._message = email_message
 
-        except Exception as e:
-            # Log any exceptions that occur during the sending process
-            self._log.exception(f"Error sending report: {e}")
-
-        else:
-            # Log a debug message indicating the report was sent successfully
-            self._log.debug("Report sent")
+        return email_message